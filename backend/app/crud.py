@@ -1,155 +1,220 @@
 """
 Database CRUD operations
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from typing import AsyncIterator, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import desc, insert, select
 from app.database import Ticket, AnalysisRun, TicketAnalysis
 
 
 # ==================== TICKET OPERATIONS ====================
 
-def create_tickets(db: Session, tickets_data: List[dict]) -> List[Ticket]:
+async def create_tickets(db: AsyncSession, tickets_data: List[dict]) -> List[Ticket]:
     """
     Create multiple tickets in bulk.
-    
+
     Args:
         db: Database session
         tickets_data: List of dicts with 'title' and 'description' keys
-        
+
     Returns:
         List of created Ticket objects
     """
-    tickets = [
-        Ticket(title=ticket["title"], description=ticket["description"])
-        for ticket in tickets_data
-    ]
-    db.add_all(tickets)
-    db.commit()
-    for ticket in tickets:
-        db.refresh(ticket)
+    # An empty parameter list would degenerate to INSERT ... DEFAULT
+    # VALUES and trip the NOT NULL constraints; there is nothing to do.
+    if not tickets_data:
+        return []
+
+    # Bulk insert with RETURNING pulls back server defaults (id,
+    # created_at) in the same round-trip, instead of one refresh SELECT
+    # per row after the commit. sort_by_parameter_order makes the
+    # returned rows match input order, which insertmanyvalues does not
+    # otherwise guarantee.
+    result = await db.execute(
+        insert(Ticket).returning(Ticket, sort_by_parameter_order=True),
+        [
+            {"title": ticket["title"], "description": ticket["description"]}
+            for ticket in tickets_data
+        ]
+    )
+    tickets = list(result.scalars().all())
+    await db.commit()
     return tickets
 
 
-def get_tickets(db: Session, skip: int = 0, limit: int = 100) -> List[Ticket]:
+async def get_tickets(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Ticket]:
     """
     Get all tickets with pagination.
-    
+
     Args:
         db: Database session
         skip: Number of records to skip
         limit: Maximum number of records to return
-        
+
     Returns:
         List of Ticket objects
     """
-    return db.query(Ticket).offset(skip).limit(limit).all()
+    result = await db.execute(select(Ticket).offset(skip).limit(limit))
+    return list(result.scalars().all())
 
 
-def get_ticket(db: Session, ticket_id: int) -> Optional[Ticket]:
+async def stream_tickets(db: AsyncSession, chunk_size: int = 100) -> AsyncIterator[List[Ticket]]:
+    """
+    Stream all tickets in chunks via a server-side cursor.
+
+    Unlike get_tickets this never materializes the whole table in
+    memory, so callers can analyze arbitrarily many tickets with peak
+    memory bounded by chunk_size.
+
+    Args:
+        db: Database session
+        chunk_size: Number of tickets per yielded chunk
+
+    Yields:
+        Lists of up to chunk_size Ticket objects
+    """
+    result = await db.stream(
+        select(Ticket).execution_options(yield_per=chunk_size)
+    )
+    async for partition in result.scalars().partitions(chunk_size):
+        yield list(partition)
+
+
+async def get_ticket(db: AsyncSession, ticket_id: int) -> Optional[Ticket]:
     """
     Get a single ticket by ID.
-    
+
     Args:
         db: Database session
         ticket_id: ID of the ticket
-        
+
     Returns:
         Ticket object or None if not found
     """
-    return db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    result = await db.execute(select(Ticket).filter(Ticket.id == ticket_id))
+    return result.scalars().first()
 
 
-def get_tickets_by_ids(db: Session, ticket_ids: List[int]) -> List[Ticket]:
+async def get_tickets_by_ids(db: AsyncSession, ticket_ids: List[int]) -> List[Ticket]:
     """
     Get multiple tickets by their IDs.
-    
+
     Args:
         db: Database session
         ticket_ids: List of ticket IDs
-        
+
     Returns:
         List of Ticket objects
     """
-    return db.query(Ticket).filter(Ticket.id.in_(ticket_ids)).all()
+    result = await db.execute(select(Ticket).filter(Ticket.id.in_(ticket_ids)))
+    return list(result.scalars().all())
 
 
 # ==================== ANALYSIS RUN OPERATIONS ====================
 
-def create_analysis_run(db: Session, summary: Optional[str] = None) -> AnalysisRun:
+async def create_analysis_run(
+    db: AsyncSession,
+    summary: Optional[str] = None,
+    commit: bool = True
+) -> AnalysisRun:
     """
     Create a new analysis run.
-    
+
     Args:
         db: Database session
         summary: Optional summary text
-        
+        commit: Commit immediately; pass False when the caller owns the
+            transaction and commits once at the end
+
     Returns:
         Created AnalysisRun object
     """
-    analysis_run = AnalysisRun(summary=summary)
-    db.add(analysis_run)
-    db.commit()
-    db.refresh(analysis_run)
+    result = await db.execute(
+        insert(AnalysisRun).returning(AnalysisRun),
+        [{"summary": summary}]
+    )
+    analysis_run = result.scalars().one()
+    if commit:
+        await db.commit()
     return analysis_run
 
 
-def get_analysis_run(db: Session, run_id: int) -> Optional[AnalysisRun]:
+async def get_analysis_run(db: AsyncSession, run_id: int) -> Optional[AnalysisRun]:
     """
     Get an analysis run by ID.
-    
+
     Args:
         db: Database session
         run_id: ID of the analysis run
-        
+
     Returns:
         AnalysisRun object or None if not found
     """
-    return db.query(AnalysisRun).filter(AnalysisRun.id == run_id).first()
+    result = await db.execute(select(AnalysisRun).filter(AnalysisRun.id == run_id))
+    return result.scalars().first()
 
 
-def get_latest_analysis_run(db: Session) -> Optional[AnalysisRun]:
+async def get_latest_analysis_run(db: AsyncSession) -> Optional[AnalysisRun]:
     """
     Get the most recent analysis run.
-    
+
     Args:
         db: Database session
-        
+
     Returns:
         Latest AnalysisRun object or None if no runs exist
     """
-    return db.query(AnalysisRun).order_by(desc(AnalysisRun.created_at)).first()
+    result = await db.execute(
+        select(AnalysisRun).order_by(desc(AnalysisRun.created_at)).limit(1)
+    )
+    return result.scalars().first()
 
 
-def update_analysis_run_summary(db: Session, run_id: int, summary: str) -> Optional[AnalysisRun]:
+async def update_analysis_run_summary(
+    db: AsyncSession,
+    run_id: int,
+    summary: str,
+    commit: bool = True
+) -> Optional[AnalysisRun]:
     """
     Update the summary of an analysis run.
-    
+
     Args:
         db: Database session
         run_id: ID of the analysis run
         summary: Summary text to set
-        
+        commit: Commit immediately; pass False when the caller owns the
+            transaction and commits once at the end
+
     Returns:
         Updated AnalysisRun object or None if not found
     """
-    analysis_run = db.query(AnalysisRun).filter(AnalysisRun.id == run_id).first()
+    analysis_run = await get_analysis_run(db, run_id)
     if analysis_run:
         analysis_run.summary = summary
-        db.commit()
-        db.refresh(analysis_run)
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
     return analysis_run
 
 
 # ==================== TICKET ANALYSIS OPERATIONS ====================
 
-def create_ticket_analyses(
-    db: Session, 
-    analyses_data: List[dict]
-) -> List[TicketAnalysis]:
+async def create_ticket_analyses(
+    db: AsyncSession,
+    analyses_data: List[dict],
+    commit: bool = True
+) -> List:
     """
     Create multiple ticket analyses in bulk.
-    
+
+    The insert stays at the Core level: one multi-row INSERT with
+    RETURNING, and the returned rows are plain Row tuples rather than
+    ORM instances, so no identity-map entries or instance state are
+    allocated for what is a write-and-respond path.
+
     Args:
         db: Database session
         analyses_data: List of dicts with keys:
@@ -158,127 +223,155 @@ def create_ticket_analyses(
             - category: str
             - priority: str
             - notes: Optional[str]
-            
+        commit: Commit immediately; pass False when the caller owns the
+            transaction and commits once at the end
+
     Returns:
-        List of created TicketAnalysis objects
+        List of inserted rows (id, analysis_run_id, ticket_id, category,
+        priority, notes), in insert order
     """
-    analyses = [
-        TicketAnalysis(
-            analysis_run_id=analysis["analysis_run_id"],
-            ticket_id=analysis["ticket_id"],
-            category=analysis.get("category"),
-            priority=analysis.get("priority"),
-            notes=analysis.get("notes")
-        )
-        for analysis in analyses_data
-    ]
-    db.add_all(analyses)
-    db.commit()
-    for analysis in analyses:
-        db.refresh(analysis)
+    if not analyses_data:
+        return []
+
+    result = await db.execute(
+        insert(TicketAnalysis).returning(
+            TicketAnalysis.id,
+            TicketAnalysis.analysis_run_id,
+            TicketAnalysis.ticket_id,
+            TicketAnalysis.category,
+            TicketAnalysis.priority,
+            TicketAnalysis.notes,
+            sort_by_parameter_order=True
+        ),
+        [
+            {
+                "analysis_run_id": analysis["analysis_run_id"],
+                "ticket_id": analysis["ticket_id"],
+                "category": analysis.get("category"),
+                "priority": analysis.get("priority"),
+                "notes": analysis.get("notes")
+            }
+            for analysis in analyses_data
+        ]
+    )
+    analyses = list(result.all())
+    if commit:
+        await db.commit()
     return analyses
 
 
-def get_ticket_analyses_by_run_id(
-    db: Session, 
+async def get_ticket_analyses_by_run_id(
+    db: AsyncSession,
     run_id: int
 ) -> List[TicketAnalysis]:
     """
     Get all ticket analyses for a specific analysis run.
-    
+
     Args:
         db: Database session
         run_id: ID of the analysis run
-        
+
     Returns:
         List of TicketAnalysis objects
     """
-    return (
-        db.query(TicketAnalysis)
-        .filter(TicketAnalysis.analysis_run_id == run_id)
-        .all()
+    result = await db.execute(
+        select(TicketAnalysis).filter(TicketAnalysis.analysis_run_id == run_id)
     )
+    return list(result.scalars().all())
 
 
-def get_all_analysis_runs(db: Session, skip: int = 0, limit: int = 100) -> List[AnalysisRun]:
+async def get_all_analysis_runs(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[AnalysisRun]:
     """
     Get all analysis runs with pagination.
-    
+
     Args:
         db: Database session
         skip: Number of records to skip
         limit: Maximum number of records to return
-        
+
     Returns:
         List of AnalysisRun objects ordered by created_at (newest first)
     """
-    return (
-        db.query(AnalysisRun)
+    result = await db.execute(
+        select(AnalysisRun)
         .order_by(desc(AnalysisRun.created_at))
         .offset(skip)
         .limit(limit)
-        .all()
     )
+    return list(result.scalars().all())
 
 
-def get_analysis_run_with_tickets(db: Session, run_id: int) -> Optional[dict]:
+async def get_analysis_run_with_tickets(
+    db: AsyncSession,
+    run_id: int,
+    include_tickets: bool = True
+) -> Optional[dict]:
     """
     Get a specific analysis run with all ticket analyses and their associated tickets.
-    
+
     Args:
         db: Database session
         run_id: ID of the analysis run
-        
+        include_tickets: Eager-load the ticket relationship; pass False
+            when the caller won't serialize tickets, skipping the
+            selectin SELECT entirely
+
     Returns:
         Dictionary with:
             - analysis_run: AnalysisRun object
             - ticket_analyses: List of TicketAnalysis objects with loaded ticket relationships
         Returns None if analysis run not found
     """
-    analysis_run = get_analysis_run(db, run_id)
+    analysis_run = await get_analysis_run(db, run_id)
     if not analysis_run:
         return None
-    
-    # Get ticket analyses with eager loading of ticket relationship
-    ticket_analyses = (
-        db.query(TicketAnalysis)
-        .filter(TicketAnalysis.analysis_run_id == run_id)
-        .all()
-    )
-    
+
+    # Get ticket analyses, eager loading the ticket relationship only
+    # when the caller will actually use it
+    query = select(TicketAnalysis).filter(TicketAnalysis.analysis_run_id == run_id)
+    if include_tickets:
+        query = query.options(selectinload(TicketAnalysis.ticket))
+    result = await db.execute(query)
+
     return {
         "analysis_run": analysis_run,
-        "ticket_analyses": ticket_analyses
+        "ticket_analyses": list(result.scalars().all())
     }
 
 
-def get_latest_analysis_with_tickets(db: Session) -> Optional[dict]:
+async def get_latest_analysis_with_tickets(
+    db: AsyncSession,
+    include_tickets: bool = True
+) -> Optional[dict]:
     """
     Get the latest analysis run with all ticket analyses and their associated tickets.
     This is used for the GET /api/analysis/latest endpoint.
-    
+
     Args:
         db: Database session
-        
+        include_tickets: Eager-load the ticket relationship; pass False
+            when the caller won't serialize tickets
+
     Returns:
         Dictionary with:
             - analysis_run: AnalysisRun object
             - ticket_analyses: List of TicketAnalysis objects with loaded ticket relationships
         Returns None if no analysis runs exist
     """
-    analysis_run = get_latest_analysis_run(db)
+    analysis_run = await get_latest_analysis_run(db)
     if not analysis_run:
         return None
-    
-    # Get ticket analyses with eager loading of ticket relationship
-    ticket_analyses = (
-        db.query(TicketAnalysis)
-        .filter(TicketAnalysis.analysis_run_id == analysis_run.id)
-        .all()
+
+    # Get ticket analyses, eager loading the ticket relationship only
+    # when the caller will actually use it
+    query = select(TicketAnalysis).filter(
+        TicketAnalysis.analysis_run_id == analysis_run.id
     )
-    
+    if include_tickets:
+        query = query.options(selectinload(TicketAnalysis.ticket))
+    result = await db.execute(query)
+
     return {
         "analysis_run": analysis_run,
-        "ticket_analyses": ticket_analyses
+        "ticket_analyses": list(result.scalars().all())
     }
-
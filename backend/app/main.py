@@ -1,20 +1,30 @@
 """
 FastAPI application entry point
 """
+import asyncio
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app import database
 from app.database import get_db
-from app import crud, schemas
-from app.agent import analyze_tickets_with_agent
+from app import crud, schemas, schemas_fast
+from app.agent import (
+    analyze_tickets_from_chunks,
+    analyze_tickets_with_agent,
+    generate_summary_node,
+    stream_ticket_analyses
+)
 # Load environment variables
 load_dotenv()
 
@@ -33,11 +43,14 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up FastAPI application...")
     try:
-        database.create_tables()
+        await database.create_tables()
         logger.info("Database tables created/verified successfully")
     except Exception as e:
         logger.warning(f"Could not create database tables: {e}")
         logger.warning("Make sure PostgreSQL is running and DATABASE_URL is configured correctly")
+    # Build the OpenAPI document now; FastAPI memoizes it on
+    # app.openapi_schema, so no request pays for schema generation.
+    app.openapi()
     yield
     # Shutdown
     logger.info("Shutting down FastAPI application...")
@@ -46,7 +59,10 @@ app = FastAPI(
     title="AI Support Ticket Assist",
     description="Backend API for AI-powered support ticket analysis",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Every handler that returns dicts/models renders through orjson's
+    # C encoder (native datetime support) instead of stdlib json.
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -75,26 +91,213 @@ async def health_check():
     return {"status": "healthy"}
 
 
+# Batches below this size validate inline; the executor round-trip
+# costs more than it saves for small lists.
+_PARALLEL_VALIDATE_MIN = 64
+# Bodies at or below this size take the single-pass validate_json
+# route; chunked parallel validation needs the list parsed up front,
+# which only pays off for bodies well past this point.
+_SMALL_BODY_BYTES = 16 * 1024
+_VALIDATION_WORKERS = os.cpu_count() or 4
+_VALIDATION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_VALIDATION_WORKERS,
+    thread_name_prefix="validate"
+)
+
+
+def _ticket_error_detail(exc: ValidationError, offset: int = 0) -> list:
+    """Rebase validation errors onto the full request body.
+
+    Chunked validation reports item indices relative to the chunk;
+    shift them by the chunk's start and prefix "tickets" so every 422
+    detail has the same ("tickets", index, field) shape as the
+    single-pass body validator.
+    """
+    detail = []
+    for err in exc.errors(include_url=False, include_input=False):
+        loc = err["loc"]
+        if loc and isinstance(loc[0], int):
+            err["loc"] = ("tickets", loc[0] + offset) + tuple(loc[1:])
+        else:
+            err["loc"] = ("tickets",) + tuple(loc)
+        detail.append(err)
+    return detail
+
+
+async def _validate_tickets(tickets_raw: list) -> List[schemas.TicketCreate]:
+    """Validate a raw tickets list, chunked off the event loop when large.
+
+    Validation itself runs under the GIL, so this is not a multi-core
+    speedup; the executor keeps big-batch validation off the event loop
+    thread (other requests keep being served) and chunking bounds how
+    long any single validate_python call blocks a worker.
+
+    Raises HTTPException(422) with locations rebased onto the full
+    body, since per-chunk errors are chunk-relative.
+    """
+    if len(tickets_raw) < _PARALLEL_VALIDATE_MIN:
+        try:
+            return schemas.TicketCreateListAdapter.validate_python(tickets_raw)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=_ticket_error_detail(e)
+            )
+
+    chunk_size = -(-len(tickets_raw) // _VALIDATION_WORKERS)
+    starts = range(0, len(tickets_raw), chunk_size)
+    loop = asyncio.get_running_loop()
+    outcomes = await asyncio.gather(*[
+        loop.run_in_executor(
+            _VALIDATION_EXECUTOR,
+            schemas.TicketCreateListAdapter.validate_python,
+            tickets_raw[start:start + chunk_size]
+        )
+        for start in starts
+    ], return_exceptions=True)
+
+    detail = []
+    for start, outcome in zip(starts, outcomes):
+        if isinstance(outcome, ValidationError):
+            detail.extend(_ticket_error_detail(outcome, offset=start))
+        elif isinstance(outcome, BaseException):
+            raise outcome
+    if detail:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=detail
+        )
+    return [ticket for chunk in outcomes for ticket in chunk]
+
+
+def _full_analysis_response(result: dict) -> Response:
+    """Serialize an analysis-detail dict in the default nested shape.
+
+    One validate_python pass over the eager-loaded ORM rows, then
+    dump_json, which fuses the dict dump and JSON encode into a single
+    Rust-side pass — no intermediate dict tree and no response_model
+    revalidation. The routes keep their response_model for the docs.
+    """
+    envelope = schemas._ADAPTERS.latest_resp.validate_python(result, from_attributes=True)
+    return Response(
+        content=schemas._ADAPTERS.latest_resp.dump_json(envelope),
+        media_type="application/json"
+    )
+
+
+def _lite_analysis_response(result: dict) -> ORJSONResponse:
+    """Serialize an analysis-detail dict without nested tickets.
+
+    Same envelope as the full shape, but each row is the lite model, so
+    no per-row nested ticket is validated or serialized.
+    """
+    return ORJSONResponse({
+        "analysis_run": schemas.AnalysisRunResponse.from_orm_fast(result["analysis_run"]).model_dump(),
+        "ticket_analyses": [
+            schemas.TicketAnalysisResponseLite.from_orm_fast(row).model_dump()
+            for row in result["ticket_analyses"]
+        ]
+    })
+
+
+def _flat_analysis_response(result: dict) -> ORJSONResponse:
+    """Serialize an analysis-detail dict in the flat (SoA) shape.
+
+    Deduplicates the eager-loaded tickets so each is serialized once,
+    with the analyses referencing them by ticket_id.
+    """
+    tickets_by_id = {}
+    analyses = []
+    for row in result["ticket_analyses"]:
+        if row.ticket is not None and row.ticket_id not in tickets_by_id:
+            tickets_by_id[row.ticket_id] = schemas.TicketResponse.from_orm_fast(row.ticket)
+        analyses.append(schemas.TicketAnalysisFlat.from_orm_fast(row))
+    payload = schemas.AnalysisDetailFlatResponse.model_construct(
+        analysis_run=schemas.AnalysisRunResponse.from_orm_fast(result["analysis_run"]),
+        tickets=list(tickets_by_id.values()),
+        analyses=analyses,
+    )
+    return ORJSONResponse(payload.model_dump())
+
+
 # ==================== API ENDPOINTS ====================
 
-@app.post("/api/tickets", response_model=schemas.TicketsCreateResponse, status_code=status.HTTP_201_CREATED)
+# Hand-written request-body schema: the handler reads the raw body
+# itself, so FastAPI cannot infer the docs from a parameter.
+_TICKETS_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "application/json": {
+            "schema": {
+                "type": "object",
+                "required": ["tickets"],
+                "properties": {
+                    "tickets": {
+                        "type": "array",
+                        "items": schemas.SCHEMA_CACHE["TicketCreate"]
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+@app.post(
+    "/api/tickets",
+    response_model=schemas.TicketsCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": _TICKETS_REQUEST_BODY}
+)
 async def create_tickets(
-    request: schemas.TicketsCreateRequest,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create multiple tickets.
-    
+
     Body: array of { title: string; description: string }
     Returns: inserted tickets
     """
+    # Parse and validate the body by hand. Small bodies go through
+    # validate_json: one Rust-side parse+validate pass over the raw
+    # bytes, no intermediate dict. Large bodies are parsed with orjson
+    # so the list can be chunked across the thread pool.
+    raw = await request.body()
     try:
-        tickets_data = [{"title": t.title, "description": t.description} for t in request.tickets]
-        created_tickets = crud.create_tickets(db, tickets_data)
-        logger.info(f"Created {len(created_tickets)} tickets")
-        return schemas.TicketsCreateResponse(
-            tickets=[schemas.TicketResponse.model_validate(ticket) for ticket in created_tickets]
+        if len(raw) <= _SMALL_BODY_BYTES:
+            tickets = schemas.TicketsBodyAdapter.validate_json(raw)["tickets"]
+        else:
+            try:
+                payload = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Request body is not valid JSON"
+                )
+            tickets_raw = payload.get("tickets") if isinstance(payload, dict) else None
+            if not isinstance(tickets_raw, list):
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail='Request body must be an object with a "tickets" array'
+                )
+            tickets = await _validate_tickets(tickets_raw)
+    except ValidationError as e:
+        # include_input=False: for validate_json failures the offending
+        # input is the raw bytes, which don't serialize into the detail
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_input=False)
         )
+
+    try:
+        # One Rust-side pass over the validated models instead of a
+        # Python attribute-read comprehension per ticket
+        tickets_data = schemas.TicketCreateListAdapter.dump_python(tickets)
+        created_tickets = await crud.create_tickets(db, tickets_data)
+        logger.info(f"Created {len(created_tickets)} tickets")
+        # response_model performs the only validation/serialization pass
+        return {"tickets": created_tickets}
     except Exception as e:
         logger.error(f"Error creating tickets: {e}")
         raise HTTPException(
@@ -103,18 +306,52 @@ async def create_tickets(
         )
 
 
-@app.get("/api/tickets", response_model=List[schemas.TicketResponse])
+# Documented response for the msgspec fast path: TicketResponse with
+# created_at as the epoch-ms integer actually sent on the wire, rather
+# than the ISO date-time the Pydantic model would imply.
+_TICKET_FAST_SCHEMA = {
+    **schemas.SCHEMA_CACHE["TicketResponse"],
+    "properties": {
+        **schemas.SCHEMA_CACHE["TicketResponse"]["properties"],
+        "created_at": {
+            "title": "Created At",
+            "type": "integer",
+            "description": "Creation time as epoch milliseconds"
+        }
+    }
+}
+
+
+@app.get(
+    "/api/tickets",
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": _TICKET_FAST_SCHEMA}
+                }
+            }
+        }
+    }
+)
 async def get_tickets(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all tickets with pagination.
     """
     try:
-        tickets = crud.get_tickets(db, skip=skip, limit=limit)
-        return [schemas.TicketResponse.model_validate(ticket) for ticket in tickets]
+        tickets = await crud.get_tickets(db, skip=skip, limit=limit)
+        # No response_model pass at all: msgspec encodes the structs
+        # straight to bytes, and the hand-written responses= schema on
+        # the route documents the actual wire shape.
+        return Response(
+            content=schemas_fast.encode_tickets(tickets),
+            media_type="application/json"
+        )
     except Exception as e:
         logger.error(f"Error fetching tickets: {e}")
         raise HTTPException(
@@ -126,19 +363,19 @@ async def get_tickets(
 @app.get("/api/tickets/{ticket_id}", response_model=schemas.TicketResponse)
 async def get_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get a specific ticket by ID.
     """
     try:
-        ticket = crud.get_ticket(db, ticket_id=ticket_id)
+        ticket = await crud.get_ticket(db, ticket_id=ticket_id)
         if ticket is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Ticket with ID {ticket_id} not found"
             )
-        return schemas.TicketResponse.model_validate(ticket)
+        return ticket
     except HTTPException:
         raise
     except Exception as e:
@@ -152,10 +389,10 @@ async def get_ticket(
 @app.post("/api/analyze", response_model=schemas.AnalyzeResponse, status_code=status.HTTP_201_CREATED)
 async def analyze_tickets(
     request: schemas.AnalyzeRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Analyze tickets using LangGraph agent.
+    Analyze tickets using the agent pipeline.
     
     Body: (optional) { ticketIds: number[] }
     - If ticketIds provided, analyze only those tickets
@@ -165,47 +402,59 @@ async def analyze_tickets(
     Returns the created analysis_run and per-ticket analysis.
     """
     try:
-        # Determine which tickets to analyze
+        # Create analysis run. The run, its analyses, and the summary
+        # update are committed together at the end of the handler: one
+        # WAL fsync instead of three, and no orphan run row if the
+        # analysis fails mid-way.
+        analysis_run = await crud.create_analysis_run(db, summary=None, commit=False)
+
         if request.ticket_ids:
-            tickets = crud.get_tickets_by_ids(db, request.ticket_ids)
+            tickets = await crud.get_tickets_by_ids(db, request.ticket_ids)
             if len(tickets) != len(request.ticket_ids):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Some ticket IDs were not found"
                 )
+            if not tickets:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No tickets found to analyze"
+                )
+
+            logger.info(f"Starting analysis for {len(tickets)} tickets")
+
+            # Call the agent pipeline to analyze tickets
+            try:
+                analysis_results = await analyze_tickets_with_agent(tickets, analysis_run.id)
+            except Exception as e:
+                logger.error(f"Error in agent analysis: {e}")
+                # Fallback: create empty analyses if agent fails
+                analysis_results = {
+                    "analysis_results": [
+                        {
+                            "ticket_id": ticket.id,
+                            "category": None,
+                            "priority": None,
+                            "notes": f"Analysis failed: {str(e)}"
+                        }
+                        for ticket in tickets
+                    ],
+                    "summary": f"Analysis encountered an error: {str(e)}"
+                }
         else:
-            tickets = crud.get_tickets(db, skip=0, limit=1000)  # Get all tickets
-        
-        if not tickets:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No tickets found to analyze"
+            # Analyze everything: stream tickets from the DB in chunks
+            # through a server-side cursor, pipelining fetch with
+            # analysis. No hard cap and no full-table materialization.
+            logger.info("Starting streaming analysis of all tickets")
+            analysis_results = await analyze_tickets_from_chunks(
+                crud.stream_tickets(db), analysis_run.id
             )
-        
-        logger.info(f"Starting analysis for {len(tickets)} tickets")
-        
-        # Create analysis run
-        analysis_run = crud.create_analysis_run(db, summary=None)
-        
-        # Call LangGraph agent to analyze tickets
-        try:
-            analysis_results = await analyze_tickets_with_agent(tickets, analysis_run.id)
-        except Exception as e:
-            logger.error(f"Error in agent analysis: {e}")
-            # Fallback: create empty analyses if agent fails
-            analysis_results = {
-                "analysis_results": [
-                    {
-                        "ticket_id": ticket.id,
-                        "category": None,
-                        "priority": None,
-                        "notes": f"Analysis failed: {str(e)}"
-                    }
-                    for ticket in tickets
-                ],
-                "summary": f"Analysis encountered an error: {str(e)}"
-            }
-        
+            if not analysis_results["analysis_results"]:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No tickets found to analyze"
+                )
+
         # Prepare analyses data for database
         analyses_data = []
         for result in analysis_results["analysis_results"]:
@@ -218,17 +467,29 @@ async def analyze_tickets(
             })
         
         # Create ticket analyses
-        ticket_analyses = crud.create_ticket_analyses(db, analyses_data)
-        
-        # Update analysis run with summary
-        crud.update_analysis_run_summary(db, analysis_run.id, analysis_results["summary"])
-        db.refresh(analysis_run)
+        ticket_analyses = await crud.create_ticket_analyses(db, analyses_data, commit=False)
+
+        # Update analysis run with summary, then commit the whole flow
+        analysis_run = await crud.update_analysis_run_summary(
+            db, analysis_run.id, analysis_results["summary"], commit=False
+        )
+        await db.commit()
         
         logger.info(f"Analysis run {analysis_run.id} created with {len(ticket_analyses)} analyses")
-        
-        return schemas.AnalyzeResponse(
-            analysis_run=schemas.AnalysisRunResponse.model_validate(analysis_run),
-            ticket_analyses=[schemas.TicketAnalysisResponse.model_validate(ta) for ta in ticket_analyses]
+
+        # Hand the row loop to pydantic-core: one validate_python call
+        # over the RETURNING rows and one dump_python call back out,
+        # instead of FastAPI revalidating through the response_model.
+        # The response_model stays on the route for the OpenAPI docs.
+        analyses = schemas.TicketAnalysisListAdapter.validate_python(
+            ticket_analyses, from_attributes=True
+        )
+        return ORJSONResponse(
+            {
+                "analysis_run": schemas.AnalysisRunResponse.from_orm_fast(analysis_run).model_dump(),
+                "ticket_analyses": schemas.TicketAnalysisListAdapter.dump_python(analyses)
+            },
+            status_code=status.HTTP_201_CREATED
         )
         
     except HTTPException:
@@ -241,19 +502,104 @@ async def analyze_tickets(
         )
 
 
+# Cap for the analyze-all case of the SSE endpoint; see its docstring
+_STREAM_ANALYZE_MAX_TICKETS = 1000
+
+
+@app.post("/api/analyze/stream")
+async def analyze_tickets_stream(
+    request: schemas.AnalyzeRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Analyze tickets and stream per-ticket results as Server-Sent Events.
+
+    Body: (optional) { ticketIds: number[] }
+
+    Emits one 'data:' event per completed analysis batch (a JSON array
+    of per-ticket results), then a final event with the analysis run and
+    summary. Results are persisted per batch, so the client sees
+    progress without waiting for the whole run.
+
+    Unlike /api/analyze, the analyze-all case here is capped at the
+    first _STREAM_ANALYZE_MAX_TICKETS tickets: the event stream writes
+    each batch on the same session, which cannot happen while a
+    server-side cursor is open on it. Pass explicit ticket_ids to go
+    beyond the cap.
+    """
+    # Determine which tickets to analyze. Same selection as
+    # /api/analyze except for the analyze-all cap described above.
+    if request.ticket_ids:
+        tickets = await crud.get_tickets_by_ids(db, request.ticket_ids)
+        if len(tickets) != len(request.ticket_ids):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Some ticket IDs were not found"
+            )
+    else:
+        tickets = await crud.get_tickets(db, skip=0, limit=_STREAM_ANALYZE_MAX_TICKETS)
+
+    if not tickets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No tickets found to analyze"
+        )
+
+    logger.info(f"Starting streaming analysis for {len(tickets)} tickets")
+    analysis_run = await crud.create_analysis_run(db, summary=None)
+
+    async def event_stream():
+        collected = []
+        try:
+            async for chunk in stream_ticket_analyses(tickets):
+                collected.extend(chunk)
+                # Persist the batch before emitting it, so everything
+                # the client has seen is already in the database
+                await crud.create_ticket_analyses(db, [
+                    {"analysis_run_id": analysis_run.id, **result}
+                    for result in chunk
+                ])
+                yield f"data: {orjson.dumps(chunk).decode()}\n\n"
+
+            summary_state = generate_summary_node({
+                "tickets": tickets,
+                "analysis_results": collected,
+                "summary": "",
+                "run_id": analysis_run.id
+            })
+            await crud.update_analysis_run_summary(db, analysis_run.id, summary_state["summary"])
+            final_event = {
+                "analysis_run_id": analysis_run.id,
+                "summary": summary_state["summary"],
+                "done": True
+            }
+            yield f"data: {orjson.dumps(final_event).decode()}\n\n"
+        except Exception as e:
+            logger.error(f"Error in streaming analysis: {e}")
+            yield f"data: {orjson.dumps({'error': str(e)}).decode()}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.get("/api/analysis/runs", response_model=List[schemas.AnalysisRunResponse])
 async def get_all_analysis_runs(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all analysis runs with pagination.
     Returns analysis runs ordered by created_at (newest first).
     """
     try:
-        analysis_runs = crud.get_all_analysis_runs(db, skip=skip, limit=limit)
-        return [schemas.AnalysisRunResponse.model_validate(run) for run in analysis_runs]
+        analysis_runs = await crud.get_all_analysis_runs(db, skip=skip, limit=limit)
+        # model_construct skips field validation on the trusted rows,
+        # and returning a Response directly skips the response_model
+        # pass; the response_model stays for the OpenAPI docs.
+        return ORJSONResponse([
+            schemas.AnalysisRunResponse.from_orm_fast(run).model_dump()
+            for run in analysis_runs
+        ])
     except Exception as e:
         logger.error(f"Error fetching analysis runs: {e}")
         raise HTTPException(
@@ -263,38 +609,38 @@ async def get_all_analysis_runs(
 
 
 @app.get("/api/analysis/latest", response_model=schemas.LatestAnalysisResponse)
-async def get_latest_analysis(db: Session = Depends(get_db)):
+async def get_latest_analysis(
+    flat: bool = False,
+    include_tickets: bool = True,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get the latest analysis run with all ticket analyses and their associated tickets.
+
+    With ?flat=true, returns the structure-of-arrays shape
+    (AnalysisDetailFlatResponse): tickets once in their own list,
+    analyses referencing them by ticket_id. With ?include_tickets=false,
+    rows omit the nested ticket and the ticket query is skipped.
     """
     try:
-        result = crud.get_latest_analysis_with_tickets(db)
-        
+        # The flat shape still ships tickets, so it keeps the eager load
+        result = await crud.get_latest_analysis_with_tickets(
+            db, include_tickets=include_tickets or flat
+        )
+
         if not result:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No analysis runs found"
             )
-        
-        # Build response with ticket data included
-        ticket_analyses_response = []
-        for ta in result["ticket_analyses"]:
-            ta_dict = {
-                "id": ta.id,
-                "analysis_run_id": ta.analysis_run_id,
-                "ticket_id": ta.ticket_id,
-                "category": ta.category,
-                "priority": ta.priority,
-                "notes": ta.notes,
-                "ticket": schemas.TicketResponse.model_validate(ta.ticket) if ta.ticket else None
-            }
-            ticket_analyses_response.append(schemas.TicketAnalysisResponse(**ta_dict))
-        
-        return schemas.LatestAnalysisResponse(
-            analysis_run=schemas.AnalysisRunResponse.model_validate(result["analysis_run"]),
-            ticket_analyses=ticket_analyses_response
-        )
-        
+
+        if not include_tickets and not flat:
+            return _lite_analysis_response(result)
+        if flat:
+            return _flat_analysis_response(result)
+
+        return _full_analysis_response(result)
+
     except HTTPException:
         raise
     except Exception as e:
@@ -308,39 +654,37 @@ async def get_latest_analysis(db: Session = Depends(get_db)):
 @app.get("/api/analysis/{run_id}", response_model=schemas.LatestAnalysisResponse)
 async def get_analysis_by_id(
     run_id: int,
-    db: Session = Depends(get_db)
+    flat: bool = False,
+    include_tickets: bool = True,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get a specific analysis run by ID with all ticket analyses and their associated tickets.
+
+    With ?flat=true, returns the structure-of-arrays shape
+    (AnalysisDetailFlatResponse) instead of nesting each ticket. With
+    ?include_tickets=false, rows omit the nested ticket and the ticket
+    query is skipped.
     """
     try:
-        result = crud.get_analysis_run_with_tickets(db, run_id)
-        
+        # The flat shape still ships tickets, so it keeps the eager load
+        result = await crud.get_analysis_run_with_tickets(
+            db, run_id, include_tickets=include_tickets or flat
+        )
+
         if not result:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Analysis run with ID {run_id} not found"
             )
-        
-        # Build response with ticket data included
-        ticket_analyses_response = []
-        for ta in result["ticket_analyses"]:
-            ta_dict = {
-                "id": ta.id,
-                "analysis_run_id": ta.analysis_run_id,
-                "ticket_id": ta.ticket_id,
-                "category": ta.category,
-                "priority": ta.priority,
-                "notes": ta.notes,
-                "ticket": schemas.TicketResponse.model_validate(ta.ticket) if ta.ticket else None
-            }
-            ticket_analyses_response.append(schemas.TicketAnalysisResponse(**ta_dict))
-        
-        return schemas.LatestAnalysisResponse(
-            analysis_run=schemas.AnalysisRunResponse.model_validate(result["analysis_run"]),
-            ticket_analyses=ticket_analyses_response
-        )
-        
+
+        if not include_tickets and not flat:
+            return _lite_analysis_response(result)
+        if flat:
+            return _flat_analysis_response(result)
+
+        return _full_analysis_response(result)
+
     except HTTPException:
         raise
     except Exception as e:
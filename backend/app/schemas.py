@@ -1,9 +1,25 @@
 """
 Pydantic schemas for request/response validation
 """
-from typing import Optional, List
+from types import SimpleNamespace
+from typing import Literal, Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_serializer, field_validator
+from typing_extensions import TypedDict
+
+# Shared config for the output DTOs: they are built once from trusted
+# DB rows and never mutated, so freeze instances, never revalidate them
+# when nested in another model, and drop unknown attributes instead of
+# carrying them.
+_RESPONSE_CONFIG = ConfigDict(
+    from_attributes=True,
+    frozen=True,
+    revalidate_instances="never",
+    extra="ignore",
+    # Build core schemas at class creation, not on first validate; the
+    # rebuild loop at the bottom of this module depends on it.
+    defer_build=False,
+)
 
 
 # ==================== TICKET SCHEMAS ====================
@@ -20,13 +36,32 @@ class TicketCreate(TicketBase):
 class TicketResponse(TicketBase):
     id: int
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
+    model_config = _RESPONSE_CONFIG
 
-class TicketsCreateRequest(BaseModel):
-    tickets: List[TicketCreate]
+    @field_validator("created_at", mode="before")
+    @classmethod
+    def _accept_epoch_ms(cls, value):
+        # The fast serialization path puts created_at on the wire as
+        # epoch milliseconds; accept that form back alongside ISO/datetime.
+        if isinstance(value, int):
+            return datetime.fromtimestamp(value / 1000)
+        return value
+
+    @classmethod
+    def from_orm_fast(cls, row) -> "TicketResponse":
+        """Build from a Ticket row without running field validation.
+
+        The DB layer already guarantees these types, so model_construct
+        skips the per-field validator dispatch that from_attributes
+        conversion would run for every row.
+        """
+        return cls.model_construct(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            created_at=row.created_at,
+        )
 
 
 class TicketsCreateResponse(BaseModel):
@@ -43,17 +78,47 @@ class AnalysisRunResponse(BaseModel):
     id: int
     created_at: datetime
     summary: Optional[str] = None
-    
-    class Config:
-        from_attributes = True
+
+    model_config = _RESPONSE_CONFIG
+
+    @classmethod
+    def from_orm_fast(cls, row) -> "AnalysisRunResponse":
+        """Build from an AnalysisRun row without field validation."""
+        return cls.model_construct(
+            id=row.id,
+            created_at=row.created_at,
+            summary=row.summary,
+        )
 
 
 # ==================== TICKET ANALYSIS SCHEMAS ====================
 
+# The closed label sets the agent emits (normalized in
+# agent._normalize_result). Literal compiles to a hashed lookup in
+# pydantic-core, and the member strings are interned once and shared
+# across every validated row. "" is the not-analyzed sentinel from the
+# fields below, serialized back to null.
+Category = Literal["billing", "bug", "feature_request", "account", "technical", "other", ""]
+Priority = Literal["low", "medium", "high", "critical", ""]
+
+
 class TicketAnalysisBase(BaseModel):
-    category: Optional[str] = None
-    priority: Optional[str] = None
-    notes: Optional[str] = None
+    # Literal/str with "" default instead of Optional[...]: a single
+    # validator per field rather than a value-or-None union dispatch.
+    # None from nullable DB columns is mapped to "" on the way in and
+    # back to null on the way out, so the wire shape is unchanged.
+    category: Category = ""
+    priority: Priority = ""
+    notes: str = ""
+
+    @field_validator("category", "priority", "notes", mode="before")
+    @classmethod
+    def _none_to_empty(cls, value):
+        return "" if value is None else value
+
+    @field_serializer("category", "priority", "notes")
+    def _empty_to_none(self, value):
+        return value or None
 
 
 class TicketAnalysisCreate(TicketAnalysisBase):
@@ -66,13 +131,59 @@ class TicketAnalysisResponse(TicketAnalysisBase):
     analysis_run_id: int
     ticket_id: int
     ticket: Optional[TicketResponse] = None
-    
-    class Config:
-        from_attributes = True
+
+    model_config = _RESPONSE_CONFIG
+
+    @classmethod
+    def from_orm_fast(cls, row) -> "TicketAnalysisResponse":
+        """Build from a TicketAnalysis row without field validation.
+
+        Only safe when the ticket relationship is already eager-loaded
+        (or absent); attribute access here must not trigger lazy IO.
+        """
+        return cls.model_construct(
+            id=row.id,
+            analysis_run_id=row.analysis_run_id,
+            ticket_id=row.ticket_id,
+            category=row.category,
+            priority=row.priority,
+            notes=row.notes,
+            ticket=TicketResponse.from_orm_fast(row.ticket) if row.ticket else None,
+        )
+
+
+class TicketAnalysisFlat(TicketAnalysisBase):
+    """Ticket analysis row without the nested ticket.
+
+    Used by the flat (structure-of-arrays) response shape, where tickets
+    are shipped once in a sibling list and clients join on ticket_id.
+    """
+    id: int
+    analysis_run_id: int
+    ticket_id: int
+
+    model_config = _RESPONSE_CONFIG
+
+    @classmethod
+    def from_orm_fast(cls, row) -> "TicketAnalysisFlat":
+        """Build from a TicketAnalysis row without field validation."""
+        return cls.model_construct(
+            id=row.id,
+            analysis_run_id=row.analysis_run_id,
+            ticket_id=row.ticket_id,
+            category=row.category,
+            priority=row.priority,
+            notes=row.notes,
+        )
 
 
 # ==================== ANALYSIS REQUEST/RESPONSE SCHEMAS ====================
 
+# Lite row for endpoints asked not to expand tickets: structurally the
+# flat row — same fields, no nested ticket — so it shares the model.
+TicketAnalysisResponseLite = TicketAnalysisFlat
+
+
 class AnalyzeRequest(BaseModel):
     ticket_ids: Optional[List[int]] = None
 
@@ -86,3 +197,77 @@ class LatestAnalysisResponse(BaseModel):
     analysis_run: AnalysisRunResponse
     ticket_analyses: List[TicketAnalysisResponse]
 
+
+class AnalysisDetailFlatResponse(BaseModel):
+    """Flat variant of LatestAnalysisResponse.
+
+    Each ticket appears once in `tickets` instead of being re-embedded
+    in every analysis row, so N analyses over M distinct tickets
+    allocate M nested models instead of N.
+    """
+    analysis_run: AnalysisRunResponse
+    tickets: List[TicketResponse]
+    analyses: List[TicketAnalysisFlat]
+
+
+# ==================== LIST ADAPTERS ====================
+
+# TypeAdapters for the list-shaped hot paths, built once at import so
+# the pydantic-core validator/serializer is constructed a single time
+# per process instead of per call.
+
+class TicketsCreateBody(TypedDict):
+    """Shape of the bulk-create request body, as a TypedDict so its
+    adapter can validate raw JSON bytes in one pass with no
+    intermediate model instance for the envelope."""
+    tickets: List[TicketCreate]
+
+
+_ADAPTERS = SimpleNamespace(
+    tickets_in=TypeAdapter(List[TicketCreate]),
+    tickets_body=TypeAdapter(TicketsCreateBody),
+    analyses_out=TypeAdapter(List[TicketAnalysisResponse]),
+    analyze_resp=TypeAdapter(AnalyzeResponse),
+    latest_resp=TypeAdapter(LatestAnalysisResponse),
+)
+
+# Established names for the adapters above; same objects, kept so call
+# sites read as what they validate.
+TicketCreateListAdapter = _ADAPTERS.tickets_in
+TicketsBodyAdapter = _ADAPTERS.tickets_body
+TicketAnalysisListAdapter = _ADAPTERS.analyses_out
+
+# Force every core schema to finish building at import time so no
+# request ever pays for a deferred model_rebuild.
+for _model in (
+    TicketResponse,
+    TicketsCreateResponse,
+    AnalysisRunResponse,
+    TicketAnalysisResponse,
+    TicketAnalysisFlat,
+    AnalyzeResponse,
+    LatestAnalysisResponse,
+    AnalysisDetailFlatResponse,
+):
+    _model.model_rebuild(force=False)
+del _model
+
+# JSON schemas computed once at import, keyed by model name. Callers
+# that embed schemas in hand-written OpenAPI fragments read from here
+# instead of re-walking the models with model_json_schema() per use.
+SCHEMA_CACHE = {
+    _m.__name__: _m.model_json_schema()
+    for _m in (
+        TicketCreate,
+        TicketResponse,
+        TicketsCreateResponse,
+        AnalysisRunResponse,
+        TicketAnalysisResponse,
+        TicketAnalysisFlat,
+        AnalyzeRequest,
+        AnalyzeResponse,
+        LatestAnalysisResponse,
+        AnalysisDetailFlatResponse,
+    )
+}
+